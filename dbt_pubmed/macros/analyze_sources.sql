@@ -0,0 +1,25 @@
+{% macro analyze_pubmed_sources() %}
+    {#-
+        Refresh planner statistics of the bronze tables dlt has just loaded, so the
+        staging/intermediate models are planned against real row counts instead of
+        the empty-table estimates left behind by a fresh (truncated) baseline load.
+        Tables that do not exist yet are skipped.
+
+        Plain ANALYZE rather than VACUUM ANALYZE: the bronze tables are append-only
+        (truncated, not deleted from, on a fresh baseline), so there are few dead
+        tuples to reclaim, while VACUUM would scan every page of these large tables
+        on each run and hold a SHARE UPDATE EXCLUSIVE lock on them while it does.
+    -#}
+    {%- if execute -%}
+        {%- for node in graph.sources.values() if node.source_name == 'pubmed' -%}
+            {%- set relation = adapter.get_relation(
+                database=node.database,
+                schema=node.schema,
+                identifier=node.identifier
+            ) -%}
+            {%- if relation is not none %}
+    analyze {{ relation }};
+            {%- endif -%}
+        {%- endfor -%}
+    {%- endif -%}
+{% endmacro %}
@@ -0,0 +1,17 @@
+{% macro bronze_record_seq(relation) %}
+    {#-
+        record_seq (the position of a record in its file) was added to the bronze
+        tables after they were first loaded. dlt adds the column on the next load of
+        each table, so a table that has not been loaded since (e.g. bronze_pubmed_updates
+        after a '--load baseline' run) does not have it yet. Select NULL for it then;
+        the deduplication sorts NULL record_seq last.
+    -#}
+    {%- if execute -%}
+        {%- set column_names = adapter.get_columns_in_relation(relation) | map(attribute='name') | map('lower') | list -%}
+    {%- endif -%}
+    {%- if not execute or 'record_seq' in column_names -%}
+        record_seq
+    {%- else -%}
+        null::bigint as record_seq
+    {%- endif -%}
+{% endmacro %}
@@ -1,11 +1,14 @@
 {% macro extract_pubmed_common_fields(source_alias) %}
-        -- PMID
-        case
-            when jsonb_typeof({{ source_alias }}.raw_data -> 'MedlineCitation' -> 'PMID' -> 0) = 'string' then
-                 {{ source_alias }}.raw_data -> 'MedlineCitation' -> 'PMID' ->> 0
-            else
-                 {{ source_alias }}.raw_data -> 'MedlineCitation' -> 'PMID' -> 0 ->> '#text'
-        end as pmid,
+        -- PMID (object with '#text' when it carries attributes, otherwise a plain string;
+        -- a path into a string yields null. The string guard keeps an attribute-only
+        -- object such as <PMID Version="1"/> null instead of its JSON text)
+        coalesce(
+            {{ source_alias }}.raw_data #>> '{MedlineCitation,PMID,0,#text}',
+            case
+                when jsonb_typeof({{ source_alias }}.raw_data #> '{MedlineCitation,PMID,0}') = 'string' then
+                     {{ source_alias }}.raw_data #>> '{MedlineCitation,PMID,0}'
+            end
+        ) as pmid,
 
         -- Title
         case
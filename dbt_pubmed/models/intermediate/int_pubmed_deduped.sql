@@ -1,7 +1,14 @@
+{#-
+    Btree index on the merge key: the incremental delete+insert and the
+    hard-delete post-hook both join on source_id.
+-#}
 {{
     config(
         materialized='incremental',
         unique_key='source_id',
+        indexes=[
+            {'columns': ['source_id'], 'unique': True}
+        ],
         pre_hook="""
             {% if is_incremental() %}
                 -- Create watermark table only if incremental and the target table exists
@@ -26,7 +33,7 @@
                             pmid,
                             operation,
                             -- Rank to find the latest operation for this PMID in the batch
-                            row_number() over (partition by pmid order by file_name desc, ingestion_ts desc) as rn
+                            row_number() over (partition by pmid order by file_name desc, ingestion_ts desc, record_seq desc nulls last) as rn
                         from {{ ref('stg_pubmed_citations') }}
                         where ingestion_ts > (select max_ts from pubmed_deduped_watermark)
                     ) s
@@ -53,8 +60,10 @@ ranked as (
         *,
         -- Rank by file_name (alphanumeric sort) to determine the latest state.
         -- Files are named like pubmed24n0001.xml.gz, pubmed24n1001.xml.gz
-        -- Higher number = later.
-        row_number() over (partition by pmid order by file_name desc, ingestion_ts desc) as rn
+        -- Higher number = later. Records of one file share an ingestion_ts,
+        -- so within a file the later record (record_seq) wins. Rows loaded before
+        -- record_seq existed have it NULL and rank after those that have it.
+        row_number() over (partition by pmid order by file_name desc, ingestion_ts desc, record_seq desc nulls last) as rn
     from source_data
     where pmid is not null
 ),
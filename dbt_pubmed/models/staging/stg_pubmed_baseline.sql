@@ -6,6 +6,7 @@ parsed as (
     select
         file_name,
         ingestion_ts,
+        {{ bronze_record_seq(source('pubmed', 'bronze_pubmed_baseline')) }},
         content_hash,
         raw_data,
         -- Use macro for extraction
@@ -8,6 +8,7 @@ with baseline as (
     select
         file_name,
         ingestion_ts,
+        record_seq,
         content_hash,
         pmid,
         title,
@@ -29,6 +30,7 @@ updates as (
     select
         file_name,
         ingestion_ts,
+        record_seq,
         content_hash,
         pmid,
         title,
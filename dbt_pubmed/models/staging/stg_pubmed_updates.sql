@@ -7,6 +7,7 @@ upserts as (
     select
         file_name,
         ingestion_ts,
+        {{ bronze_record_seq(source('pubmed', 'bronze_pubmed_updates')) }},
         content_hash,
         -- Use macro for extraction
         {{ extract_pubmed_common_fields('source') }},
@@ -22,12 +23,13 @@ deletes as (
     select
         file_name,
         ingestion_ts,
+        {{ bronze_record_seq(source('pubmed', 'bronze_pubmed_updates')) }},
         content_hash,
         -- PMID extraction from exploded array elements
-        case
-            when jsonb_typeof(pmid_elem) = 'string' then pmid_elem #>> '{}'
-            else pmid_elem ->> '#text'
-        end as pmid,
+        coalesce(
+            pmid_elem ->> '#text',
+            case when jsonb_typeof(pmid_elem) = 'string' then pmid_elem #>> '{}' end
+        ) as pmid,
         null::text as title,
         null::text as abstract_text,
         null::text as pub_year,
@@ -9,14 +9,19 @@
 # Source Code: https://github.com/CoReason-AI/coreason_etl_pubmedabstracts
 
 import argparse
+import os
 import sys
-from typing import List, Optional
+from typing import List, Optional, cast
 
 import dlt
+from dlt.common.configuration.utils import add_config_to_env
+from dlt.common.logger import is_json_logging
+from dlt.common.utils import with_custom_environ
 from dlt.helpers.dbt import create_runner
+from dlt.helpers.dbt.runner import DBTPackageRunner
 from dlt.sources import DltSource
 
-from coreason_etl_pubmedabstracts.pipelines.pubmed_pipeline import pubmed_source
+from coreason_etl_pubmedabstracts.pipelines.pubmed_pipeline import BASELINE_RESOURCE, UPDATES_RESOURCE, pubmed_source
 from coreason_etl_pubmedabstracts.utils.logger import logger
 
 
@@ -36,36 +41,80 @@ def get_args(args: Optional[List[str]] = None) -> argparse.Namespace:
     return parser.parse_args(args)
 
 
+@with_custom_environ
+def _run_dbt_build(runner: DBTPackageRunner, command_args: List[str]) -> None:
+    """
+    Execute 'dbt build' for the runner's package inside the current process.
+
+    DBTPackageRunner spawns a fresh `python -c` subprocess per command, paying the dbt import,
+    adapter registration and manifest load on every run. dlt's `run_dbt_command` drives
+    `dbtRunner().invoke(...)` directly, so we reuse the runner's resolved profile and credentials
+    and call it here through `init_logging_and_run_dbt_command`, the same entry point (and dbt
+    log level/format from the runner's runtime config) as the subprocess path. The environment
+    is restored afterwards, as the subprocess path does.
+    """
+    # Deferred: importing dbt_utils imports dbt-core itself.
+    from dlt.helpers.dbt.dbt_utils import init_logging_and_run_dbt_command
+
+    # dlt's profiles.yml reads the credentials from DLT__ prefixed environment variables
+    if runner.credentials:
+        add_config_to_env(runner.credentials, ("dlt",))
+
+    init_logging_and_run_dbt_command(
+        runner.config.runtime.log_level,
+        is_json_logging(runner.config.runtime.log_format),
+        runner.package_path,
+        "build",
+        # Always set once the runner config is resolved (defaults to dlt's bundled profiles)
+        cast(str, runner.config.package_profiles_dir),
+        runner.config.package_profile_name,
+        command_args=command_args,
+    )
+
+
 def run_dbt_transformations(pipeline: dlt.Pipeline, project_dir: str = "dbt_pubmed") -> None:
     """
     Execute dbt build to transform loaded data using dlt's built-in dbt runner.
     """
     logger.info("Starting dbt transformations...")
-    try:
-        # Get credentials from the pipeline configuration
-        with pipeline.destination_client() as client:
-            # Create dlt's dbt runner
-            # venv=None uses current environment (where dbt-postgres is installed)
-            runner = create_runner(
-                venv=None,
-                credentials=client.config,
-                working_dir=".",  # Current directory as base
-                package_location=project_dir,  # Path to dbt project
-            )
-
-            # Use _run_dbt_command to execute 'dbt build'.
-            # 'dbt build' is preferred over 'run' + 'test' as it runs models, tests,
-            # seeds, and snapshots in DAG order, ensuring correctness and handling dependencies.
-            # While _run_dbt_command is protected, it's the only way to invoke 'build'
-            # via the current DBTPackageRunner API, and essential for the 'snapshot' requirement.
-            logger.info("Running dbt build...")
-            runner._run_dbt_command("build", cmd_params=["--fail-fast"])
-
-        logger.info("dbt transformations completed successfully.")
+    # Get credentials from the pipeline configuration
+    with pipeline.destination_client() as client:
+        # Create dlt's dbt runner
+        # venv=None uses current environment (where dbt-postgres is installed)
+        runner = create_runner(
+            venv=None,
+            credentials=client.config,
+            working_dir=".",  # Current directory as base
+            package_location=project_dir,  # Path to dbt project
+        )
+
+        # 'dbt build' is preferred over 'run' + 'test' as it runs models, tests,
+        # seeds, and snapshots in DAG order, ensuring correctness and handling dependencies.
+        # It runs in-process by default; set COREASON_DBT_SUBPROCESS=1 to isolate dbt in a
+        # subprocess via the protected _run_dbt_command (the only way to invoke 'build'
+        # through the current DBTPackageRunner API).
+        logger.info("Running dbt build...")
+        if os.environ.get("COREASON_DBT_SUBPROCESS") == "1":
+            runner._run_dbt_command("build", command_args=["--fail-fast"])
+        else:
+            _run_dbt_build(runner, ["--fail-fast"])
 
-    except Exception as e:
-        logger.error(f"dbt transformations failed: {e}")
-        raise e
+    logger.info("dbt transformations completed successfully.")
+
+
+def _baseline_last_value(pipeline: dlt.Pipeline, source_name: str) -> Optional[str]:
+    """
+    Return the 'file_name' incremental cursor of the pubmed_baseline resource, or None on a fresh run.
+
+    `pipeline.state` re-loads the state from the pipeline working directory on every access,
+    so it is read exactly once here and walked locally.
+    """
+    # The structure is: sources -> source_name -> resources -> resource_name -> incremental -> param
+    state = pipeline.state
+    source_state = state.get("sources", {}).get(source_name, {})
+    resource_state = source_state.get("resources", {}).get(BASELINE_RESOURCE, {})
+    last_value: Optional[str] = resource_state.get("incremental", {}).get("file_name", {}).get("last_value")
+    return last_value
 
 
 def _prepare_baseline_load(pipeline: dlt.Pipeline, source: DltSource) -> None:
@@ -76,15 +125,10 @@ def _prepare_baseline_load(pipeline: dlt.Pipeline, source: DltSource) -> None:
     """
     logger.info("Checking incremental state for pubmed_baseline...")
     try:
-        # dlt state logic: check if 'pubmed_baseline' has processed files
-        # The structure is: sources -> source_name -> resources -> resource_name -> incremental -> param
-        state = pipeline.state
-        source_state = state.get("sources", {}).get(source.name, {})
-        resource_state = source_state.get("resources", {}).get("pubmed_baseline", {})
-        incremental_state = resource_state.get("incremental", {}).get("file_name", {})
+        last_value = _baseline_last_value(pipeline, source.name)
 
         # If no last_value, it implies a fresh run (or state reset).
-        if not incremental_state.get("last_value"):
+        if not last_value:
             logger.info("No incremental state found (Fresh Run). Truncating 'bronze_pubmed_baseline'...")
             # Use fully qualified table name: dataset_name.table_name
             table_name = f"{pipeline.dataset_name}.bronze_pubmed_baseline"
@@ -95,9 +139,7 @@ def _prepare_baseline_load(pipeline: dlt.Pipeline, source: DltSource) -> None:
                 except Exception as e:
                     logger.warning(f"Could not truncate {table_name} (might not exist yet): {e}")
         else:
-            logger.info(
-                f"Incremental state found (Resuming from {incremental_state.get('last_value')}). Skipping truncate."
-            )
+            logger.info(f"Incremental state found (Resuming from {last_value}). Skipping truncate.")
 
     except Exception as e:
         logger.warning(f"State check/truncation failed: {e}. Proceeding with load.")
@@ -127,11 +169,12 @@ def run_pipeline(load_target: str, dry_run: bool = False) -> None:
         return
 
     # Determine which resources to run
+    load_baseline = load_target in ("baseline", "all")
     resources_to_run = []
-    if load_target in ("baseline", "all"):
-        resources_to_run.append("pubmed_baseline")
+    if load_baseline:
+        resources_to_run.append(BASELINE_RESOURCE)
     if load_target in ("updates", "all"):
-        resources_to_run.append("pubmed_updates")
+        resources_to_run.append(UPDATES_RESOURCE)
 
     if not resources_to_run:
         logger.warning("No resources selected to run.")
@@ -145,12 +188,13 @@ def run_pipeline(load_target: str, dry_run: bool = False) -> None:
     source = source.with_resources(*resources_to_run)
 
     # 2. Resumable Replace Logic for Baseline
-    if "pubmed_baseline" in resources_to_run:
+    if load_baseline:
         _prepare_baseline_load(pipeline, source)
 
     # 3. Run the Pipeline
     info = pipeline.run(source)
-    logger.info(f"Pipeline run completed. Load Info: {info}")
+    # LoadInfo.__str__ walks every load package and job; only build it if a sink accepts INFO
+    logger.opt(lazy=True).info("Pipeline run completed. Load Info: {}", lambda: info)
 
     # 4. Check for success (basic check)
     if info.has_failed_jobs:
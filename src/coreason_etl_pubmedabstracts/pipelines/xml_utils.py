@@ -8,72 +8,178 @@
 #
 # Source Code: https://github.com/CoReason-AI/coreason_etl_pubmedabstracts
 
-from typing import IO, Any, Dict, Iterator
+import hashlib
+from functools import lru_cache
+from typing import IO, Any, Dict, Iterator, List, Optional
 
-import xmltodict
 from lxml import etree
 
 # Keys that should always be parsed as a list, even if only one element exists.
-FORCE_LIST_KEYS = (
-    "Author",
-    "ArticleId",
-    "Chemical",
-    "DataBank",
-    "DeleteCitation",
-    "ELocationID",
-    "GeneSymbol",
-    "Grant",
-    "Investigator",
-    "Keyword",
-    "Language",
-    "MeshHeading",
-    "NameOfSubstance",
-    "Object",
-    "OtherAbstract",
-    "OtherID",
-    "PersonalNameSubject",
-    "PMID",
-    "PublicationType",
-    "Reference",
-    "SpaceFlightMission",
-    "GeneralNote",
-    "SupplMeshName",
+FORCE_LIST_KEYS = frozenset(
+    (
+        "Author",
+        "ArticleId",
+        "Chemical",
+        "DataBank",
+        "DeleteCitation",
+        "ELocationID",
+        "GeneSymbol",
+        "Grant",
+        "Investigator",
+        "Keyword",
+        "Language",
+        "MeshHeading",
+        "NameOfSubstance",
+        "Object",
+        "OtherAbstract",
+        "OtherID",
+        "PersonalNameSubject",
+        "PMID",
+        "PublicationType",
+        "Reference",
+        "SpaceFlightMission",
+        "GeneralNote",
+        "SupplMeshName",
+    )
 )
 
 
-def _strip_namespaces(elem: etree._Element) -> None:
+# Record element -> value of the '_record_type' key injected into its record
+_RECORD_TYPES = {"MedlineCitation": "citation", "DeleteCitation": "delete"}
+
+# Key under which parse_pubmed_xml(..., content_hash=True) returns the fingerprint of a record
+CONTENT_HASH_KEY = "_content_hash"
+
+# Attributes in the reserved xml namespace keep their conventional 'xml:' prefix.
+_XML_NS = "{http://www.w3.org/XML/1998/namespace}"
+
+
+# Size of the key caches below. The PubMed DTD has a few hundred element and attribute
+# names; the bound only keeps unusual or hostile input from growing the caches forever.
+_KEY_CACHE_SIZE = 2048
+
+
+@lru_cache(maxsize=_KEY_CACHE_SIZE)
+def _local_name(tag: str) -> str:
+    """
+    Return the tag (or attribute name) without its '{namespace}' prefix.
+
+    The name is cached: lxml returns a new string for every element, and the same few
+    hundred names are repeated as dictionary keys across every record held in memory.
+    Every record then shares one key object per name instead of holding its own copy.
+    """
+    return tag.rsplit("}", 1)[-1]
+
+
+@lru_cache(maxsize=_KEY_CACHE_SIZE)
+def _attr_key(name: str) -> str:
     """
-    Remove namespaces from the element and its children in-place.
-    Also removes xmlns attributes.
+    Return the dictionary key of an attribute without a namespace (or in the 'xml:' namespace).
+    Keys are cached per attribute name, like tag names.
     """
-    # Iterate over all elements in the subtree
-    for node in elem.iter():
-        # Check if the tag has a namespace (indicated by '}')
-        if isinstance(node.tag, str) and "}" in node.tag:
-            # Replace tag with its local name
-            node.tag = etree.QName(node).localname
+    if name.startswith(_XML_NS):
+        return "@xml:" + name[len(_XML_NS) :]
+    return "@" + name
 
-    # Remove unused namespace declarations
-    etree.cleanup_namespaces(elem)
+
+@lru_cache(maxsize=_KEY_CACHE_SIZE)
+def _ns_attr_key(prefix: Optional[str], local: str) -> str:
+    """
+    Return the (cached) dictionary key of a namespaced attribute: '@prefix:local'.
+    """
+    return f"@{prefix}:{local}" if prefix else "@" + local
 
 
-def _flatten_mixed_content(elem: etree._Element, tags: tuple[str, ...]) -> None:
+def _prefixed_attr_key(elem: etree._Element, name: str) -> str:
     """
-    Flatten mixed content (remove child tags but keep text) for specified tags.
+    Return the dictionary key of a namespaced attribute: '@prefix:name', with the prefix
+    the document binds to its namespace (e.g. '@xlink:href'), as xmltodict keyed it.
+    Unlike tags, attributes keep their prefix.
     """
-    for tag in tags:
-        # Use local-name() to find tags regardless of namespace (though we strip them later)
-        for node in elem.xpath(f".//*[local-name()='{tag}']"):
-            etree.strip_tags(node, "*")
+    uri, local = name[1:].split("}", 1)
+    prefix = next((p for p, ns in elem.nsmap.items() if ns == uri and p), None)
+    return _ns_attr_key(prefix, local)
 
 
-def parse_pubmed_xml(file_stream: IO[bytes]) -> Iterator[Dict[str, Any]]:
+def _elem_to_dict(elem: etree._Element) -> Any:
+    """
+    Convert an element into the xmltodict representation of its content.
+
+    Mirrors xmltodict.parse(..., force_list=FORCE_LIST_KEYS) on the serialized element:
+    attributes become '@name' keys ('@prefix:name' when namespaced; in-scope xmlns
+    declarations are not emitted), child elements are keyed by their local name (repeated
+    or FORCE_LIST_KEYS children become lists), and the element's own character data (text
+    plus the tails of its children, whitespace stripped) is the value itself, or '#text'
+    when there are attributes or children. Comments and processing instructions are
+    skipped, but their tails still count as text.
+    """
+    item: Dict[str, Any] = {}
+    for name, value in elem.attrib.items():
+        if name[0] == "{" and not name.startswith(_XML_NS):
+            item[_prefixed_attr_key(elem, name)] = value
+        else:
+            item[_attr_key(name)] = value
+
+    text: List[str] = [elem.text] if elem.text else []
+    for child in elem:
+        if child.tail:
+            text.append(child.tail)
+        if not isinstance(child.tag, str):
+            # Comment or processing instruction
+            continue
+
+        key = _local_name(child.tag)
+        if not len(child) and not child.attrib:
+            # Leaf fast path (most PubMed elements): the value is just its stripped text
+            leaf_text = child.text
+            value = (leaf_text.strip() or None) if leaf_text else None
+        else:
+            value = _elem_to_dict(child)
+        if key in item:
+            existing = item[key]
+            # Values are only ever str, None, dict or list: an exact type check is enough
+            if type(existing) is list:
+                existing.append(value)
+            else:
+                item[key] = [existing, value]
+        elif key in FORCE_LIST_KEYS:
+            item[key] = [value]
+        else:
+            item[key] = value
+
+    data: Optional[str] = "".join(text).strip() or None
+    if not item:
+        return data
+    if data:
+        item["#text"] = data
+    return item
+
+
+# Text-heavy fields whose mixed content (<i>, <sup>, ...) is flattened to plain text
+MIXED_CONTENT_TAGS = ("ArticleTitle", "AbstractText", "VernacularTitle", "Affiliation")
+
+# One compiled query finds all of them (in any or no namespace) in a single pass over a record
+_MIXED_CONTENT_XPATH = etree.XPath(".//*[" + " or ".join(f"local-name()='{tag}'" for tag in MIXED_CONTENT_TAGS) + "]")
+
+
+def _flatten_mixed_content(elem: etree._Element) -> None:
+    """
+    Flatten mixed content (remove child tags but keep text) of the MIXED_CONTENT_TAGS fields.
+    """
+    for node in _MIXED_CONTENT_XPATH(elem):
+        etree.strip_tags(node, "*")
+
+
+def parse_pubmed_xml(file_stream: IO[bytes], content_hash: bool = False) -> Iterator[Dict[str, Any]]:
     """
     Parse a PubMed XML stream and yield dictionary records.
     Handles both MedlineCitation and DeleteCitation elements.
 
     Args:
         file_stream: A binary stream of the XML file (uncompressed).
+        content_hash: If True, each record also carries CONTENT_HASH_KEY, a BLAKE2b-128 hex
+            digest of the canonical lxml serialization of the record element, taken before
+            mixed-content flattening. It is not byte-equal to the element in the source file.
 
     Yields:
         Dictionary representations of the XML elements.
@@ -91,40 +197,49 @@ def parse_pubmed_xml(file_stream: IO[bytes]) -> Iterator[Dict[str, Any]]:
 
     try:
         # iterparse events: 'end' is sufficient for complete elements.
-        context = etree.iterparse(file_stream, events=("end",))
+        # Only record elements are reported ('{*}' matches any or no namespace), so the loop
+        # runs once per record instead of once per element. huge_tree stays off: its size and
+        # entity-expansion limits are what reject oversized text nodes and billion-laughs input.
+        context = etree.iterparse(
+            file_stream,
+            events=("end",),
+            tag=("{*}MedlineCitation", "{*}DeleteCitation"),
+            collect_ids=False,
+        )
 
         for _event, elem in context:
-            # Check tag name robustly (ignoring namespace prefix)
-            tag_name = etree.QName(elem).localname
-
-            if tag_name in ("MedlineCitation", "DeleteCitation"):
-                # 1. Flatten mixed content for text-heavy fields
-                _flatten_mixed_content(
-                    elem,
-                    ("ArticleTitle", "AbstractText", "VernacularTitle", "Affiliation"),
-                )
-
-                # 2. Strip Namespaces
-                _strip_namespaces(elem)
-
-                # 3. Convert to String
-                xml_str = etree.tostring(elem, encoding="unicode")
-
-                # 4. Parse to Dict
-                doc = xmltodict.parse(xml_str, force_list=FORCE_LIST_KEYS)
-
-                # 5. Inject Record Type
-                if tag_name == "MedlineCitation":
-                    doc["_record_type"] = "citation"
-                elif tag_name == "DeleteCitation":
-                    doc["_record_type"] = "delete"
-
-                yield doc
-
-                # 6. Memory Management
-                elem.clear()
-                while elem.getprevious() is not None:
-                    del elem.getparent()[0]
+            tag_name = _local_name(elem.tag)
+            # 0. Fingerprint the element before it is modified below
+            digest = (
+                hashlib.blake2b(etree.tostring(elem, with_tail=False), digest_size=16).hexdigest()
+                if content_hash
+                else None
+            )
+
+            # 1. Flatten mixed content for text-heavy fields (a DeleteCitation only lists PMIDs)
+            if tag_name == "MedlineCitation":
+                _flatten_mixed_content(elem)
+
+            # 2. Convert to Dict (namespaces are dropped from keys)
+            value = _elem_to_dict(elem)
+            # 3. Build the record with its injected record type
+            doc: Dict[str, Any] = {
+                tag_name: [value] if tag_name in FORCE_LIST_KEYS else value,
+                "_record_type": _RECORD_TYPES[tag_name],
+            }
+            if digest is not None:
+                doc[CONTENT_HASH_KEY] = digest
+
+            yield doc
+
+            # 4. Memory Management
+            # Records sit inside wrappers (PubmedArticle, DeleteCitation's siblings), so drop
+            # what precedes the record at every level up to the root, not only its own siblings.
+            elem.clear(keep_tail=True)
+            node, parent = elem, elem.getparent()
+            while parent is not None:
+                del parent[: parent.index(node)]
+                node, parent = parent, parent.getparent()
 
     except etree.XMLSyntaxError as e:
         if "no element found" in str(e):
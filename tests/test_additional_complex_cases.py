@@ -15,6 +15,9 @@ from typing import Any, Dict, Optional
 
 from coreason_etl_pubmedabstracts.pipelines.xml_utils import parse_pubmed_xml
 
+# MedlineDate year pattern of the SQL simulation below
+_YEAR_RE = re.compile(r"\d{4}")
+
 
 # Helper to simulate SQL extracted Year
 def extract_year_sql_simulation(pub_date: Dict[str, Any]) -> Optional[str]:
@@ -30,7 +33,7 @@ def extract_year_sql_simulation(pub_date: Dict[str, Any]) -> Optional[str]:
 
     medline_date = pub_date.get("MedlineDate")
     if medline_date:
-        match = re.search(r"\d{4}", medline_date)
+        match = _YEAR_RE.search(medline_date)
         if match:
             return match.group(0)
     return None
@@ -62,10 +65,8 @@ class TestAdditionalComplexCases(unittest.TestCase):
         record = records[0]
         self.assertEqual(record["_record_type"], "delete")
 
-        # DeleteCitation itself is in FORCE_LIST_KEYS, but xmltodict parsing of the root
-        # depends on how it is called. Inside parse_pubmed_xml, we convert the *element*
-        # to string, so the root of the dict is DeleteCitation.
-        # xmltodict.parse(..., force_list=('DeleteCitation', 'PMID'))
+        # parse_pubmed_xml converts the DeleteCitation *element*, so it is the root of the
+        # record. As a member of FORCE_LIST_KEYS, the root key is a list too.
 
         # DeleteCitation is forced to be a list, so we must access the first element
         delete_list = record["DeleteCitation"]
@@ -94,28 +95,31 @@ class TestAdditionalComplexCases(unittest.TestCase):
             ("Copyright 2010", "2010"),  # Unlikely but tests regex
         ]
 
-        for date_str, expected_year in cases:
+        # All cases in one document, parsed once; records come back in document order
+        citations = "".join(
+            f"""
+                <MedlineCitation>
+                    <PMID>{pmid}</PMID>
+                    <Article>
+                        <Journal>
+                            <JournalIssue>
+                                <PubDate>
+                                    <MedlineDate>{date_str}</MedlineDate>
+                                </PubDate>
+                            </JournalIssue>
+                        </Journal>
+                    </Article>
+                </MedlineCitation>"""
+            for pmid, (date_str, _) in enumerate(cases)
+        )
+        xml_content = f"<PubmedArticleSet>{citations}</PubmedArticleSet>".encode("utf-8")
+
+        records = list(parse_pubmed_xml(BytesIO(xml_content)))
+        self.assertEqual(len(records), len(cases))
+
+        for record, (date_str, expected_year) in zip(records, cases, strict=True):
             with self.subTest(date_str=date_str):
-                xml_content = f"""
-                <PubmedArticleSet>
-                    <MedlineCitation>
-                        <PMID>9999</PMID>
-                        <Article>
-                            <Journal>
-                                <JournalIssue>
-                                    <PubDate>
-                                        <MedlineDate>{date_str}</MedlineDate>
-                                    </PubDate>
-                                </JournalIssue>
-                            </Journal>
-                        </Article>
-                    </MedlineCitation>
-                </PubmedArticleSet>
-                """.encode("utf-8")
-
-                stream = BytesIO(xml_content)
-                records = list(parse_pubmed_xml(stream))
-                pub_date = records[0]["MedlineCitation"]["Article"]["Journal"]["JournalIssue"]["PubDate"]
+                pub_date = record["MedlineCitation"]["Article"]["Journal"]["JournalIssue"]["PubDate"]
 
                 extracted_year = extract_year_sql_simulation(pub_date)
                 self.assertEqual(extracted_year, expected_year)
@@ -127,8 +131,8 @@ class TestAdditionalComplexCases(unittest.TestCase):
         """
 
         def safe_cast_year_simulation(year_val: str) -> Optional[int]:
-            # Regex: ^\d+$
-            if re.match(r"^\d+$", year_val):
+            # Regex: ^\d+$ (ASCII digits only, at least one)
+            if year_val.isascii() and year_val.isdecimal():
                 return int(year_val)
             return None
 
@@ -136,6 +140,8 @@ class TestAdditionalComplexCases(unittest.TestCase):
         self.assertIsNone(safe_cast_year_simulation("2023a"))
         self.assertIsNone(safe_cast_year_simulation("2023-01"))  # Strict digit check
         self.assertIsNone(safe_cast_year_simulation("Unknown"))
+        self.assertIsNone(safe_cast_year_simulation(""))
+        self.assertIsNone(safe_cast_year_simulation("\u0662\u0660\u0662\u0663"))  # Arabic-Indic digits
 
     def test_mixed_content_flattening_complex(self) -> None:
         """
@@ -179,24 +185,12 @@ class TestAdditionalComplexCases(unittest.TestCase):
         """
         Verify that Language is forced to a list, enabling the SQL UNNEST logic.
         """
-        # Case 1: Single Language
-        xml_1 = b"""
+        xml_content = b"""
         <PubmedArticleSet>
             <MedlineCitation>
                 <PMID>1</PMID>
                 <Article><Language>eng</Language></Article>
             </MedlineCitation>
-        </PubmedArticleSet>
-        """
-        stream = BytesIO(xml_1)
-        rec = list(parse_pubmed_xml(stream))[0]
-        langs = rec["MedlineCitation"]["Article"]["Language"]
-        self.assertIsInstance(langs, list)
-        self.assertEqual(langs[0], "eng")
-
-        # Case 2: Multiple Languages
-        xml_2 = b"""
-        <PubmedArticleSet>
             <MedlineCitation>
                 <PMID>2</PMID>
                 <Article>
@@ -206,9 +200,15 @@ class TestAdditionalComplexCases(unittest.TestCase):
             </MedlineCitation>
         </PubmedArticleSet>
         """
-        stream = BytesIO(xml_2)
-        rec = list(parse_pubmed_xml(stream))[0]
-        langs = rec["MedlineCitation"]["Article"]["Language"]
+        single, multiple = parse_pubmed_xml(BytesIO(xml_content))
+
+        # Case 1: Single Language
+        langs = single["MedlineCitation"]["Article"]["Language"]
+        self.assertIsInstance(langs, list)
+        self.assertEqual(langs[0], "eng")
+
+        # Case 2: Multiple Languages
+        langs = multiple["MedlineCitation"]["Article"]["Language"]
         self.assertIsInstance(langs, list)
         self.assertEqual(len(langs), 2)
         self.assertIn("fra", langs)
@@ -8,12 +8,52 @@
 #
 # Source Code: https://github.com/CoReason-AI/coreason_etl_pubmedabstracts
 
+import io
 import unittest
 from io import BytesIO
-from typing import Any
+from typing import Any, Iterator
 
 from coreason_etl_pubmedabstracts.pipelines.xml_utils import parse_pubmed_xml
 
+# A single citation around an Article body (bytes %-format: '%b' takes the body)
+_CITATION_ENVELOPE = b"""
+<PubmedArticleSet>
+    <MedlineCitation>
+        <PMID>1</PMID>
+        <Article>
+            %b
+        </Article>
+    </MedlineCitation>
+</PubmedArticleSet>
+"""
+
+
+class _ChunkStream(io.RawIOBase):
+    """
+    Non-seekable binary stream serving pre-built chunks, like a network or gzip stream.
+    Reading it whole at once fails, so parsing must consume it incrementally.
+    """
+
+    def __init__(self, chunks: Iterator[bytes]):
+        self._chunks = chunks
+        self._pending = b""
+        self.chunks_read = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer: Any) -> int:
+        if not self._pending:
+            self._pending = next(self._chunks, b"")
+            self.chunks_read += 1
+        size = min(len(buffer), len(self._pending))
+        buffer[:size] = self._pending[:size]
+        self._pending = self._pending[size:]
+        return size
+
+    def readall(self) -> bytes:
+        raise AssertionError("The stream must not be read whole")
+
 
 class TestAdvancedResilience(unittest.TestCase):
     """
@@ -37,10 +77,10 @@ class TestAdvancedResilience(unittest.TestCase):
         </ns1:PubmedArticleSet>
         """
         stream = BytesIO(xml_content)
-        records = list(parse_pubmed_xml(stream))
+        records = parse_pubmed_xml(stream)
 
-        self.assertEqual(len(records), 1)
-        record = records[0]
+        record = next(records)
+        self.assertIsNone(next(records, None))
 
         # The root key must be EXACTLY "MedlineCitation", not "ns1:MedlineCitation"
         keys = list(record.keys())
@@ -62,7 +102,7 @@ class TestAdvancedResilience(unittest.TestCase):
         xml_utils only strips tags for: ArticleTitle, AbstractText, VernacularTitle, Affiliation.
 
         If we have mixed content in another field (e.g. 'CoIStatement'),
-        xmltodict behavior is typically to split it into '#text' and children.
+        it is split into '#text' and children.
         We want to document/verify this behavior.
         """
         xml_content = b"""
@@ -76,18 +116,12 @@ class TestAdvancedResilience(unittest.TestCase):
         </PubmedArticleSet>
         """
         stream = BytesIO(xml_content)
-        records = list(parse_pubmed_xml(stream))
+        record = next(parse_pubmed_xml(stream))
 
-        coi = records[0]["MedlineCitation"]["Article"]["CoIStatement"]
+        coi = record["MedlineCitation"]["Article"]["CoIStatement"]
 
-        # xmltodict default behavior for mixed content:
-        # It creates a complex object or list logic.
-        # Actually xmltodict usually preserves order if configured,
-        # but for standard mixed content without special config, it looks like:
-        # {'#text': 'This is  statement.', 'b': 'bold'} (text might be split or concatenated?)
-        # Let's inspect what we get.
-
-        # If it returns a dictionary, it's what we expect from xmltodict.
+        # Unflattened mixed content keeps the children as keys and joins the text around them:
+        # {'b': 'bold', '#text': 'This is  statement.'}
         # We just want to ensure it doesn't crash or return None.
         self.assertIsInstance(coi, (dict, str, list))
 
@@ -96,33 +130,45 @@ class TestAdvancedResilience(unittest.TestCase):
             # Just verifying existence of data
             self.assertTrue(any(k for k in coi.keys()))
 
+    def test_large_stream_simulation(self) -> None:
+        """
+        Stream many citations through a chunked, non-seekable reader and verify records are
+        yielded while the input is still being read, not after buffering the whole file.
+        """
+        count = 2000
+        single_record = b"<PubmedArticle><MedlineCitation><PMID>%d</PMID><Article>"
+        single_record += b"<AbstractText>" + b"Lorem ipsum dolor sit amet. " * 20 + b"</AbstractText>"
+        single_record += b"</Article></MedlineCitation></PubmedArticle>"
+        chunks = [b"<PubmedArticleSet>"] + [single_record % i for i in range(count)] + [b"</PubmedArticleSet>"]
+
+        stream = _ChunkStream(iter(chunks))
+        records = parse_pubmed_xml(io.BufferedReader(stream))
+
+        first = next(records)
+        self.assertEqual(first["MedlineCitation"]["PMID"], ["0"])
+        self.assertLess(stream.chunks_read, len(chunks) // 2)
+
+        rest = list(records)
+        self.assertEqual(len(rest), count - 1)
+        self.assertEqual(rest[-1]["MedlineCitation"]["PMID"], [str(count - 1)])
+
     def test_massive_nested_recursion(self) -> None:
         """
         Simulate a deeply nested structure to ensure no recursion limits are hit
         during the 'tostring' or 'parse' phase (within reason).
         """
         depth = 100
-        inner = "<Leaf>Val</Leaf>"
-        for _ in range(depth):
-            inner = f"<Nest>{inner}</Nest>"
+        inner = b"<Nest>" * depth + b"<Leaf>Val</Leaf>" + b"</Nest>" * depth
 
-        xml_content = f"""
-        <PubmedArticleSet>
-            <MedlineCitation>
-                <PMID>1</PMID>
-                <Article>
-                    {inner}
-                </Article>
-            </MedlineCitation>
-        </PubmedArticleSet>
-        """.encode("utf-8")
+        xml_content = _CITATION_ENVELOPE % inner
 
         stream = BytesIO(xml_content)
-        records = list(parse_pubmed_xml(stream))
+        records = parse_pubmed_xml(stream)
 
-        self.assertEqual(len(records), 1)
+        record = next(records)
+        self.assertIsNone(next(records, None))
         # Traverse down
-        curr = records[0]["MedlineCitation"]["Article"]
+        curr = record["MedlineCitation"]["Article"]
         for _ in range(depth):
             curr = curr["Nest"]
         self.assertEqual(curr["Leaf"], "Val")
@@ -9,11 +9,11 @@
 # Source Code: https://github.com/CoReason-AI/coreason_etl_pubmedabstracts
 
 import unittest
-from unittest.mock import MagicMock, patch
+from unittest.mock import MagicMock, PropertyMock, patch
 
 import dlt
 
-from coreason_etl_pubmedabstracts.main import _prepare_baseline_load
+from coreason_etl_pubmedabstracts.main import _baseline_last_value, _prepare_baseline_load
 from coreason_etl_pubmedabstracts.pipelines.pubmed_pipeline import _create_pubmed_resource
 
 
@@ -116,6 +116,28 @@ class TestComplexPipelineScenarios(unittest.TestCase):
         # Should NOT execute TRUNCATE
         mock_client.execute_sql.assert_not_called()
 
+    def test_baseline_last_value(self) -> None:
+        """
+        Verify the baseline cursor lookup reads the pipeline state once and tolerates missing levels.
+        """
+        mock_pipeline = MagicMock(spec=dlt.Pipeline)
+        state = PropertyMock(
+            return_value={
+                "sources": {
+                    "pubmed_source": {
+                        "resources": {"pubmed_baseline": {"incremental": {"file_name": {"last_value": "f_9.xml"}}}}
+                    }
+                }
+            }
+        )
+        type(mock_pipeline).state = state
+
+        self.assertEqual(_baseline_last_value(mock_pipeline, "pubmed_source"), "f_9.xml")
+        state.assert_called_once()
+
+        # Unknown source / fresh state
+        self.assertIsNone(_baseline_last_value(mock_pipeline, "other_source"))
+
     def test_prepare_baseline_load_table_missing(self) -> None:
         """
         Verify that if TRUNCATE fails (e.g., table missing), the error is logged but swallowed.
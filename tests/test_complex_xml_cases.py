@@ -67,9 +67,7 @@ class TestComplexXmlCases(unittest.TestCase):
         records = list(parse_pubmed_xml(stream))
 
         author = records[0]["MedlineCitation"]["Article"]["AuthorList"]["Author"][0]
-        # xmltodict behavior for empty tag with attributes: {'@ValidYN': 'Y', '#text': None} or similar?
-        # Actually usually checks if #text is present. If self-closing <Tag Attr="Val" />,
-        # it might be just {'@Attr': 'Val'}.
+        # An empty tag with attributes (<Tag Attr="Val" />) is just {'@Attr': 'Val'}, without '#text'.
         self.assertEqual(author["@ValidYN"], "Y")
         self.assertIsNone(author.get("#text"))
 
@@ -91,7 +89,7 @@ class TestComplexXmlCases(unittest.TestCase):
         records = list(parse_pubmed_xml(stream))
 
         abstract_text = records[0]["MedlineCitation"]["Article"]["Abstract"]["AbstractText"]
-        # xmltodict usually returns None for <Tag/>
+        # An empty <Tag/> is None
         self.assertIsNone(abstract_text)
 
     def test_default_namespace(self) -> None:
@@ -107,27 +105,9 @@ class TestComplexXmlCases(unittest.TestCase):
         records = list(parse_pubmed_xml(stream))
 
         self.assertEqual(len(records), 1)
-        # xmltodict usually propagates namespaces.
-        # But wait, our `xml_utils` does `etree.tostring(elem)`.
-        # lxml preserves the namespace in the string output.
-        # If default namespace is used, tags might look like `PMID` in dict if xmltodict handles it,
-        # or they might have prefixes if we aren't careful?
-        # Actually xmltodict with process_namespaces=False (default) treats xmlns as an attribute.
-        # But lxml tostring might inject prefixes like ns0:PMID if not careful.
-        # Let's see what happens.
-        # In this test case, we want to ensure we get the data out.
-
-        # NOTE: logic in xml_utils uses `etree.tostring(elem, encoding="unicode")`.
-        # lxml will likely include the namespace declaration in the output snippet
-        # or use a prefix if it was inherited from parent.
-        # Since we parse chunks, the chunk (MedlineCitation) will have the namespace.
-
-        # If xmltodict doesn't strip namespaces, the keys might be complex.
-        # For this test, we just want to ensure it doesn't crash and we can access data.
+        # Tags are keyed by their local name: the default namespace is dropped
+        # and its xmlns declaration is not emitted as an attribute.
         citation = records[0]
-        # We need to find the key for MedlineCitation. It might be 'MedlineCitation' or 'ns0:MedlineCitation'.
-        # Since we don't know exactly how lxml+xmltodict will serialize the default NS without testing,
-        # we inspect the keys.
         keys = list(citation.keys())
         # Filter out _record_type
         xml_keys = [k for k in keys if k != "_record_type"]
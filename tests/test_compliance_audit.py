@@ -9,7 +9,7 @@
 # Source Code: https://github.com/CoReason-AI/coreason_etl_pubmedabstracts
 
 import unittest
-from typing import Any, Dict, List, Set
+from typing import Any, Dict, List, Set, Tuple
 
 
 class TestComplianceHardDelete(unittest.TestCase):
@@ -33,32 +33,26 @@ class TestComplianceHardDelete(unittest.TestCase):
         # Importantly, it uses the WATERMARK to scope the updates.
         ids_to_delete: Set[str] = set()
 
-        # We must group by PMID to find the 'latest' operation for each PMID in the batch
-        batch_map: Dict[str, List[Dict[str, Any]]] = {}
+        # We must find the 'latest' operation for each PMID in the batch:
+        # rank by file_name desc, ingestion_ts desc, record_seq desc nulls last (the first row wins a tie)
+        winners: Dict[str, Tuple[Tuple[str, float, int], Dict[str, Any]]] = {}
         for r in valid_updates:
             pmid = str(r["pmid"])
-            if pmid not in batch_map:
-                batch_map[pmid] = []
-            batch_map[pmid].append(r)
-
-        for pmid, rows in batch_map.items():
-            # Rank by file_name desc, ingestion_ts desc
-            rows.sort(key=lambda x: (x.get("file_name", ""), x["ingestion_ts"]), reverse=True)
-            winner = rows[0]
+            record_seq = r.get("record_seq")
+            rank = (r.get("file_name", ""), r["ingestion_ts"], -1 if record_seq is None else record_seq)
+            current = winners.get(pmid)
+            if current is None or rank > current[0]:
+                winners[pmid] = (rank, r)
 
+        for pmid, (_rank, winner) in winners.items():
             if winner["operation"] == "delete":
                 ids_to_delete.add(pmid)
 
         # 3. Identify Upserts (Incremental Merge Logic)
         # Only upsert if the winner is NOT a delete (handled by the 'upsert' filter in the model)
-        upserts: Dict[str, Dict[str, Any]] = {}
-        for pmid, rows in batch_map.items():
-            # Same ranking
-            rows.sort(key=lambda x: (x.get("file_name", ""), x["ingestion_ts"]), reverse=True)
-            winner = rows[0]
-
-            if winner["operation"] == "upsert":
-                upserts[pmid] = winner
+        upserts: Dict[str, Dict[str, Any]] = {
+            pmid: winner for pmid, (_rank, winner) in winners.items() if winner["operation"] == "upsert"
+        }
 
         # 4. Apply Changes to Existing State
 
@@ -79,12 +73,10 @@ class TestComplianceHardDelete(unittest.TestCase):
             }
 
         # Apply Deletes (Post-Hook)
-        final_state = []
-        for pmid, record in current_state.items():
-            if pmid not in ids_to_delete:
-                final_state.append(record)
+        for pmid in ids_to_delete:
+            current_state.pop(pmid, None)
 
-        return final_state
+        return list(current_state.values())
 
     def test_compliance_retraction_scenario(self) -> None:
         """
@@ -188,6 +180,36 @@ class TestComplianceHardDelete(unittest.TestCase):
 
         self.assertEqual(len(result), 0)
 
+    def test_record_seq_tie_breaking(self) -> None:
+        """
+        Scenario: Two records for one PMID in the same file share file_name and ingestion_ts.
+        The later record in the file (higher record_seq) wins.
+        """
+        existing: List[Dict[str, Any]] = [{"source_id": "E", "ingestion_ts": 100.0}]
+
+        # Revised citation followed by its deletion -> Delete wins
+        batch = [
+            {"pmid": "E", "operation": "delete", "ingestion_ts": 200.0, "record_seq": 1, "file_name": "f1"},
+            {"pmid": "E", "operation": "upsert", "ingestion_ts": 200.0, "record_seq": 0, "file_name": "f1"},
+        ]
+        self.assertEqual(self._simulate_incremental_delete(existing, batch, watermark_ts=100.0), [])
+
+        # Deletion followed by a re-issued citation -> Upsert wins
+        batch = [
+            {"pmid": "E", "operation": "upsert", "ingestion_ts": 200.0, "record_seq": 1, "file_name": "f1"},
+            {"pmid": "E", "operation": "delete", "ingestion_ts": 200.0, "record_seq": 0, "file_name": "f1"},
+        ]
+        result = self._simulate_incremental_delete(existing, batch, watermark_ts=100.0)
+        self.assertEqual([r["source_id"] for r in result], ["E"])
+        self.assertEqual(result[0]["ingestion_ts"], 200.0)
+
+        # A row loaded before record_seq existed (NULL) ranks after one that has it
+        batch = [
+            {"pmid": "E", "operation": "upsert", "ingestion_ts": 200.0, "record_seq": None, "file_name": "f1"},
+            {"pmid": "E", "operation": "delete", "ingestion_ts": 200.0, "record_seq": 0, "file_name": "f1"},
+        ]
+        self.assertEqual(self._simulate_incremental_delete(existing, batch, watermark_ts=100.0), [])
+
     def test_idempotency_of_deletes(self) -> None:
         """
         Scenario: Deleting a record that doesn't exist should be fine (No-op).
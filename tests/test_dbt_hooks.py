@@ -0,0 +1,64 @@
+# Copyright (c) 2025 CoReason, Inc.
+#
+# This software is proprietary and dual-licensed.
+# Licensed under the Prosperity Public License 3.0 (the "License").
+# A copy of the license is available at https://prosperitylicense.com/versions/3.0.0
+# For details, see the LICENSE file.
+# Commercial use beyond a 30-day trial requires a separate license.
+#
+# Source Code: https://github.com/CoReason-AI/coreason_etl_pubmedabstracts
+
+import re
+from types import SimpleNamespace
+from typing import Any, Optional
+from unittest.mock import MagicMock
+
+import jinja2
+
+
+def test_analyze_pubmed_sources_macro_renders_existing_tables() -> None:
+    """
+    Unit test for the 'analyze_pubmed_sources' on-run-start macro using Jinja2 rendering.
+    Verifies that only existing tables of the 'pubmed' source are analyzed.
+    """
+
+    # 1. Load the macro body
+    macro_path = "dbt_pubmed/macros/analyze_sources.sql"
+    with open(macro_path, "r") as f:
+        macro_content = f.read()
+
+    match = re.search(r"{% macro analyze_pubmed_sources\(\) %}(.*){% endmacro %}", macro_content, re.DOTALL)
+    assert match, "Could not find analyze_pubmed_sources macro in file"
+    template_body = match.group(1)
+
+    # 2. Mock the dbt graph: two pubmed sources (one not loaded yet) and an unrelated source
+    def source_node(source_name: str, identifier: str) -> SimpleNamespace:
+        return SimpleNamespace(source_name=source_name, database="db", schema="pubmed", identifier=identifier)
+
+    graph = {
+        "sources": {
+            "source.baseline": source_node("pubmed", "bronze_pubmed_baseline"),
+            "source.updates": source_node("pubmed", "bronze_pubmed_updates"),
+            "source.other": source_node("other", "other_table"),
+        }
+    }
+
+    def mock_get_relation(database: str, schema: str, identifier: str) -> Optional[Any]:
+        if identifier == "bronze_pubmed_updates":
+            return None
+        return f'"{database}"."{schema}"."{identifier}"'
+
+    mock_adapter = MagicMock()
+    mock_adapter.get_relation.side_effect = mock_get_relation
+
+    # 3. Render
+    env = jinja2.Environment(extensions=["jinja2.ext.do"])
+    rendered = env.from_string(template_body).render(execute=True, graph=graph, adapter=mock_adapter)
+
+    # 4. Assertions
+    statements = [s.strip() for s in rendered.split(";") if s.strip()]
+    assert statements == ['analyze "db"."pubmed"."bronze_pubmed_baseline"']
+    assert mock_adapter.get_relation.call_count == 2
+
+    # Parse time (execute=False) renders nothing, so dbt skips the hook
+    assert env.from_string(template_body).render(execute=False, graph=graph, adapter=mock_adapter).strip() == ""
@@ -1,81 +1,102 @@
+import functools
 import re
-from typing import Any, Callable, Optional
+from typing import Any, Callable, Dict, Optional
 from unittest.mock import MagicMock
 
 import jinja2
+import pytest
 
+MACRO_PATH = "dbt_pubmed/macros/postgres_partitioned_table.sql"
 
-def test_partitioned_table_macro_renders_partitions() -> None:
+# Body of the materialization block in the macro file
+_MATERIALIZATION_RE = re.compile(
+    r"{% materialization partitioned_table, adapter='postgres' %}(.*){% endmaterialization %}",
+    re.DOTALL,
+)
+
+
+@functools.lru_cache(maxsize=1)
+def _load_template() -> jinja2.Template:
     """
-    Unit test for the 'partitioned_table' macro using Jinja2 rendering.
-    Verifies that the macro generates explicit partition creation statements.
+    Read the macro file and compile its materialization body once per session.
     """
-
-    # 1. Load the macro content
-    macro_path = "dbt_pubmed/macros/postgres_partitioned_table.sql"
-    with open(macro_path, "r") as f:
+    with open(MACRO_PATH, "r") as f:
         macro_content = f.read()
 
-    # 2. Extract the body of the materialization
-    match = re.search(
-        r"{% materialization partitioned_table, adapter='postgres' %}(.*){% endmaterialization %}",
-        macro_content,
-        re.DOTALL,
-    )
+    match = _MATERIALIZATION_RE.search(macro_content)
     assert match, "Could not find materialization block in macro file"
-    template_body = match.group(1)
+    return jinja2.Environment().from_string(match.group(1))
 
-    # 3. Setup Jinja Environment and Mocks
-    env = jinja2.Environment()
 
-    # Mock Context Objects
-    mock_this = MagicMock()
-    # Mocking basic dbt Relation behavior
-    mock_this.identifier = "gold_table"
-    mock_this.__str__.return_value = '"my_schema"."gold_table"'  # type: ignore[attr-defined]
+class _Relation:
+    """
+    Minimal stand-in for a dbt Relation: quoted rendering, identifier and incorporate().
+    """
 
-    def mock_incorporate(path: Any) -> Any:
+    def __init__(self, identifier: str):
+        self.identifier = identifier
+
+    def incorporate(self, path: Dict[str, str]) -> "_Relation":
         # Simulate creating a new relation with updated identifier
-        new_identifier = path.get("identifier")
-        new_mock = MagicMock()
+        return _Relation(path["identifier"])
+
+    def __str__(self) -> str:
         # dbt quotes the identifier in __str__
-        new_mock.__str__.return_value = f'"my_schema"."{new_identifier}"'  # type: ignore[attr-defined]
-        return new_mock
+        return f'"my_schema"."{self.identifier}"'
 
-    mock_this.incorporate.side_effect = mock_incorporate
 
-    mock_config = MagicMock()
-    mock_config.get.return_value = "publication_year"  # partition_by
+def _statement(name: str, caller: Optional[Callable[[], str]] = None) -> str:
+    if caller:
+        return caller()
+    return ""
 
-    mock_adapter = MagicMock()
 
-    def mock_statement(name: str, caller: Optional[Callable[[], str]] = None) -> str:
-        if caller:
-            return caller()
-        return ""
+def _build_context() -> Dict[str, Any]:
+    """
+    Globals of the dbt Jinja context used by the materialization.
+    Plain callables stand in for functions; mocks are only used for objects with attributes.
+    """
+    mock_config = MagicMock()
+    mock_config.get.return_value = "publication_year"  # partition_by
 
-    # Mock global functions available in dbt jinja context
-    context = {
-        "this": mock_this,
+    return {
+        "this": _Relation("gold_table"),
         "config": mock_config,
-        "adapter": mock_adapter,
+        "adapter": MagicMock(),
         "model": MagicMock(name="gold_pubmed_knowledge"),
         "exceptions": MagicMock(),
-        "run_hooks": MagicMock(return_value="-- hooks run"),
-        "load_relation": MagicMock(return_value=None),
-        "make_temp_relation": MagicMock(return_value='"my_schema"."gold_table__dbt_tmp"'),
-        "create_table_as": MagicMock(return_value="CREATE TABLE tmp AS SELECT ..."),
-        "create_indexes": MagicMock(return_value="-- indexes created"),
+        "run_hooks": lambda *args, **kwargs: "-- hooks run",
+        "load_relation": lambda relation: None,
+        "make_temp_relation": lambda relation: '"my_schema"."gold_table__dbt_tmp"',
+        "create_table_as": lambda *args: "CREATE TABLE tmp AS SELECT ...",
+        "create_indexes": lambda relation: "-- indexes created",
         "sql": "SELECT * FROM ...",
-        "statement": mock_statement,
-        "return": MagicMock(return_value=""),  # Mock 'return' function
+        "statement": _statement,
+        "return": lambda *args: "",  # Mock 'return' function
     }
 
-    # 4. Render
-    template = env.from_string(template_body)
-    rendered = template.render(**context)
 
-    # 5. Assertions
+@pytest.fixture(scope="module")
+def dbt_context() -> Dict[str, Any]:
+    """
+    The dbt Jinja context, built once per module.
+    """
+    return _build_context()
+
+
+def test_partitioned_table_macro_renders_partitions(dbt_context: Dict[str, Any]) -> None:
+    """
+    Unit test for the 'partitioned_table' macro using Jinja2 rendering.
+    Verifies that the macro generates explicit partition creation statements.
+    """
+
+    # 1. Load the macro and compile the body of the materialization (cached)
+    template = _load_template()
+
+    # 2. Render
+    rendered = template.render(**dbt_context)
+
+    # 3. Assertions
     print(rendered)
 
     # Verify basic structure
@@ -91,7 +112,7 @@ def test_partitioned_table_macro_renders_partitions() -> None:
     assert 'CREATE TABLE IF NOT EXISTS "my_schema"."gold_table_2024"' in rendered
 
     # Check bounds (robust to whitespace by splitting)
-    cleaned_rendered = re.sub(r"\s+", " ", rendered)
+    cleaned_rendered = " ".join(rendered.split())
 
     expected_2024 = 'PARTITION OF "my_schema"."gold_table" FOR VALUES FROM (2024) TO (2025)'
     assert expected_2024 in cleaned_rendered, "Partition bounds for year 2024 not found"
@@ -101,4 +122,4 @@ def test_partitioned_table_macro_renders_partitions() -> None:
 
 
 if __name__ == "__main__":
-    test_partitioned_table_macro_renders_partitions()
+    test_partitioned_table_macro_renders_partitions(_build_context())
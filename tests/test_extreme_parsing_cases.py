@@ -49,7 +49,6 @@ class TestExtremeParsingCases(unittest.TestCase):
         try:
             records = list(parse_pubmed_xml(stream))
             # If it parses, verify the depth is represented (likely as nested dicts)
-            # xmltodict usually handles this.
             self.assertEqual(len(records), 1)
         except etree.XMLSyntaxError:
             # If lxml rejects it, that's also a valid outcome (security)
@@ -73,7 +72,7 @@ class TestExtremeParsingCases(unittest.TestCase):
         records = list(parse_pubmed_xml(stream))
 
         # After stripping namespaces, we have <Title>Title A</Title><Title>Title B</Title>
-        # xmltodict should convert this to Title: ['Title A', 'Title B']
+        # Repeated children become a list: Title: ['Title A', 'Title B']
 
         title_field = records[0]["MedlineCitation"]["Article"]["Title"]
         self.assertIsInstance(title_field, list)
@@ -102,14 +101,14 @@ class TestExtremeParsingCases(unittest.TestCase):
         records = list(parse_pubmed_xml(stream))
 
         abstract_text = records[0]["MedlineCitation"]["Article"]["Abstract"]["AbstractText"]
-        # xmltodict (via lxml) usually transparently handles CDATA as text
+        # lxml transparently handles CDATA as text
         self.assertEqual(abstract_text, cdata_content)
 
     def test_attribute_element_collision(self) -> None:
         """
         Verify handling when an element has an attribute with the same name as a child element
         (after potential normalization).
-        xmltodict uses '@' for attributes, so they shouldn't collide effectively.
+        Attributes are keyed with an '@' prefix, so they shouldn't collide effectively.
         """
         payload = b"""
         <PubmedArticleSet>
@@ -8,10 +8,11 @@
 #
 # Source Code: https://github.com/CoReason-AI/coreason_etl_pubmedabstracts
 
+import os
 import unittest
 from unittest.mock import MagicMock, PropertyMock, patch
 
-from coreason_etl_pubmedabstracts.main import get_args, main, run_dbt_transformations, run_pipeline
+from coreason_etl_pubmedabstracts.main import _run_dbt_build, get_args, main, run_dbt_transformations, run_pipeline
 
 
 class TestMainOrchestration(unittest.TestCase):
@@ -169,8 +170,9 @@ class TestMainOrchestration(unittest.TestCase):
 
         mock_exit.assert_called_once_with(1)
 
+    @patch("coreason_etl_pubmedabstracts.main._run_dbt_build")
     @patch("coreason_etl_pubmedabstracts.main.create_runner")
-    def test_run_dbt_transformations_success(self, mock_create_runner: MagicMock) -> None:
+    def test_run_dbt_transformations_success(self, mock_create_runner: MagicMock, mock_build: MagicMock) -> None:
         """Test run_dbt_transformations success with dlt runner."""
         mock_pipeline = MagicMock()
         mock_client = MagicMock()
@@ -190,11 +192,59 @@ class TestMainOrchestration(unittest.TestCase):
             package_location="dbt_pubmed",
         )
 
-        # Verify execution of 'dbt build'
-        mock_runner_instance._run_dbt_command.assert_called_once_with("build", cmd_params=["--fail-fast"])
+        # Verify in-process execution of 'dbt build'
+        mock_build.assert_called_once_with(mock_runner_instance, ["--fail-fast"])
+        mock_runner_instance._run_dbt_command.assert_not_called()
 
+    @patch("dlt.helpers.dbt.dbt_utils.init_logging_and_run_dbt_command")
+    @patch("coreason_etl_pubmedabstracts.main.add_config_to_env")
+    def test_run_dbt_build_in_process(self, mock_add_env: MagicMock, mock_run_dbt: MagicMock) -> None:
+        """Test _run_dbt_build invokes dbt in-process with the runner's profile and credentials."""
+        mock_runner = MagicMock()
+        mock_runner.package_path = "/work/dbt_pubmed"
+        mock_runner.config.package_profiles_dir = "/profiles"
+        mock_runner.config.package_profile_name = "postgres"
+        mock_runner.config.runtime.log_level = "WARNING"
+        mock_runner.config.runtime.log_format = "JSON"
+
+        def _set_env(*_: object) -> None:
+            os.environ["DLT__CREDENTIALS__HOST"] = "db"
+
+        mock_add_env.side_effect = _set_env
+
+        _run_dbt_build(mock_runner, ["--fail-fast"])
+
+        mock_add_env.assert_called_once_with(mock_runner.credentials, ("dlt",))
+        # Same logging setup as the subprocess path
+        mock_run_dbt.assert_called_once_with(
+            "WARNING", True, "/work/dbt_pubmed", "build", "/profiles", "postgres", command_args=["--fail-fast"]
+        )
+        # Credentials exported for dbt do not leak into the caller's environment
+        self.assertNotIn("DLT__CREDENTIALS__HOST", os.environ)
+
+        # No credentials: nothing is exported
+        mock_add_env.reset_mock()
+        mock_runner.credentials = None
+        _run_dbt_build(mock_runner, [])
+        mock_add_env.assert_not_called()
+
+    @patch.dict("os.environ", {"COREASON_DBT_SUBPROCESS": "1"})
+    @patch("coreason_etl_pubmedabstracts.main._run_dbt_build")
+    @patch("coreason_etl_pubmedabstracts.main.create_runner")
+    def test_run_dbt_transformations_subprocess(self, mock_create_runner: MagicMock, mock_build: MagicMock) -> None:
+        """Test COREASON_DBT_SUBPROCESS=1 keeps dbt isolated in dlt's subprocess runner."""
+        mock_pipeline = MagicMock()
+        mock_runner_instance = MagicMock()
+        mock_create_runner.return_value = mock_runner_instance
+
+        run_dbt_transformations(mock_pipeline)
+
+        mock_runner_instance._run_dbt_command.assert_called_once_with("build", command_args=["--fail-fast"])
+        mock_build.assert_not_called()
+
+    @patch("coreason_etl_pubmedabstracts.main._run_dbt_build")
     @patch("coreason_etl_pubmedabstracts.main.create_runner")
-    def test_run_dbt_transformations_failure(self, mock_create_runner: MagicMock) -> None:
+    def test_run_dbt_transformations_failure(self, mock_create_runner: MagicMock, mock_build: MagicMock) -> None:
         """Test run_dbt_transformations failure handling."""
         mock_pipeline = MagicMock()
         mock_client = MagicMock()
@@ -203,8 +253,8 @@ class TestMainOrchestration(unittest.TestCase):
         mock_runner_instance = MagicMock()
         mock_create_runner.return_value = mock_runner_instance
 
-        # Simulate failure in _run_dbt_command
-        mock_runner_instance._run_dbt_command.side_effect = Exception("DBT Failed")
+        # Simulate failure in dbt build
+        mock_build.side_effect = Exception("DBT Failed")
 
         with self.assertRaisesRegex(Exception, "DBT Failed"):
             run_dbt_transformations(mock_pipeline)
@@ -22,7 +22,7 @@ class TestMixedContentAndComplexity(unittest.TestCase):
     def test_mixed_content_article_title(self) -> None:
         """
         Test that ArticleTitle with internal tags (<i>, <b>, <sup>) is flattened to a single string.
-        Without flattening, xmltodict creates a dictionary and splits the text, causing data loss.
+        Without flattening, the element becomes a dictionary and the text is split, causing data loss.
         """
         xml_content = b"""
         <PubmedArticleSet>
@@ -72,8 +72,8 @@ class TestMixedContentAndComplexity(unittest.TestCase):
         # If flattened, it should be a string (or list of strings if multiple AbstractText).
         # Here we have one AbstractText.
 
-        # Note: If XML is <AbstractText>Text</AbstractText>, xmltodict -> 'Text'
-        # If <AbstractText>A <b>B</b></AbstractText>, xmltodict -> {'#text': 'A ', 'b': 'B'} (Data Loss!)
+        # Note: <AbstractText>Text</AbstractText> -> 'Text'
+        # Unflattened, <AbstractText>A <b>B</b></AbstractText> -> {'b': 'B', '#text': 'A'} (Data Loss!)
 
         # Expectation after fix:
         self.assertEqual(abstract_text, "We observed decreased levels.")
@@ -100,7 +100,7 @@ class TestMoreComplexEdgeCases(unittest.TestCase):
         # No attributes -> string "1001"
         self.assertEqual(pmids[0], "1001")
 
-        # Second one is None? xmltodict behavior for empty tag <PMID></PMID> is None
+        # Second one is None: an empty tag <PMID></PMID> has no value
         self.assertIsNone(pmids[1])
 
     def test_mixed_content_preservation_strict(self) -> None:
@@ -108,7 +108,7 @@ class TestNastyEdgeCases(unittest.TestCase):
     def test_dynamic_list_upgrade(self) -> None:
         """
         Verify behavior when a key NOT in FORCE_LIST_KEYS appears multiple times.
-        xmltodict should automatically upgrade it to a list.
+        It should automatically be upgraded to a list.
         """
         payload = b"""
         <PubmedArticleSet>
@@ -14,9 +14,11 @@ from unittest.mock import MagicMock, patch
 import dlt
 
 from coreason_etl_pubmedabstracts.pipelines.pubmed_pipeline import (
+    READ_BLOCK_SIZE,
     pubmed_source,
     pubmed_xml_parser,
 )
+from coreason_etl_pubmedabstracts.pipelines.xml_utils import CONTENT_HASH_KEY
 
 
 class TestPubmedPipeline(unittest.TestCase):
@@ -60,6 +62,10 @@ class TestPubmedPipeline(unittest.TestCase):
         resource_names = {r.name for r in resources}
         self.assertEqual(resource_names, {"pubmed_baseline", "pubmed_updates"})
 
+        # Both resources are loaded via COPY (csv loader files)
+        for resource in resources:
+            self.assertEqual(resource.compute_table_schema().get("file_format"), "csv")
+
         # Verify filesystem calls
         # 1. Baseline
         mock_filesystem.assert_any_call(
@@ -87,7 +93,12 @@ class TestPubmedPipeline(unittest.TestCase):
         mock_file_item.open.return_value.__enter__.return_value = mock_file_handle
 
         # Mock parser output
-        mock_parse.return_value = iter([{"MedlineCitation": {"PMID": "123"}}, {"MedlineCitation": {"PMID": "456"}}])
+        mock_parse.return_value = iter(
+            [
+                {"MedlineCitation": {"PMID": "123"}, CONTENT_HASH_KEY: "abc"},
+                {"MedlineCitation": {"PMID": "456"}, CONTENT_HASH_KEY: "def"},
+            ]
+        )
 
         source_data = [[mock_file_item]]
         source = dlt.resource(source_data, name="dummy_source")
@@ -102,8 +113,17 @@ class TestPubmedPipeline(unittest.TestCase):
         self.assertEqual(results[0]["file_name"], "test_file.xml.gz")
         self.assertEqual(results[0]["raw_data"]["MedlineCitation"]["PMID"], "123")
 
-        mock_file_item.open.assert_called_once()
-        mock_parse.assert_called_once_with(mock_file_handle)
+        # The parser's hash is used as is and not stored in raw_data
+        self.assertEqual(results[0]["content_hash"], "abc")
+        self.assertNotIn(CONTENT_HASH_KEY, results[0]["raw_data"])
+        self.assertEqual(results[1]["content_hash"], "def")
+        # Records of one file are stamped with the same ingestion time
+        self.assertEqual(results[0]["ingestion_ts"], results[1]["ingestion_ts"])
+        # ... and ordered within the file by their position in it
+        self.assertEqual([r["record_seq"] for r in results], [0, 1])
+
+        mock_file_item.open.assert_called_once_with(block_size=READ_BLOCK_SIZE)
+        mock_parse.assert_called_once_with(mock_file_handle, content_hash=True)
 
     @patch("coreason_etl_pubmedabstracts.pipelines.pubmed_pipeline.parse_pubmed_xml")
     def test_pubmed_xml_parser_error_handling(self, mock_parse: MagicMock) -> None:
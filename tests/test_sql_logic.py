@@ -10,7 +10,7 @@
 
 import unittest
 from io import BytesIO
-from typing import Any, Dict, List, Union
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 from coreason_etl_pubmedabstracts.pipelines.xml_utils import parse_pubmed_xml
 
@@ -40,7 +40,7 @@ class TestSqlLogic(unittest.TestCase):
         records = list(parse_pubmed_xml(stream))
 
         article = records[0]["MedlineCitation"]["Article"]
-        # xmltodict simply omits the key if the tag is missing
+        # The parser simply omits the key if the tag is missing
         self.assertNotIn("ELocationID", article)
 
         # In SQL: raw_data -> ... -> 'ELocationID' will be NULL.
@@ -116,12 +116,15 @@ class TestStagingLayerJsonLogic(unittest.TestCase):
     to handle the JSONB variants produced by XML parsing.
     """
 
-    def _simulate_pmid_extraction(self, pmid_node: Any) -> str:
+    def _simulate_pmid_extraction(self, pmid_node: Any) -> Union[str, None]:
+        """
+        Simulate coalesce(item ->> '#text', case when jsonb_typeof(item) = 'string' then item #>> '{}' end).
+        """
         first_item = pmid_node[0]
         if isinstance(first_item, str):
             return first_item
-        else:
-            return str(first_item["#text"])
+        text = first_item.get("#text")
+        return text if isinstance(text, str) else None
 
     def _simulate_title_extraction(self, title_node: Any) -> str:
         if isinstance(title_node, str):
@@ -174,6 +177,23 @@ class TestStagingLayerJsonLogic(unittest.TestCase):
         result = self._simulate_pmid_extraction(data)
         self.assertEqual(result, "12345")
 
+    def test_pmid_attributes_only(self) -> None:
+        """
+        An empty PMID with attributes parses to an object without '#text'.
+        The extraction must yield NULL (filtered by 'pmid is not null'), not the object's JSON text.
+        """
+        xml_content = b"""
+        <PubmedArticleSet>
+            <MedlineCitation><PMID Version="1"/></MedlineCitation>
+            <DeleteCitation><PMID Version="1"/></DeleteCitation>
+        </PubmedArticleSet>
+        """
+        citation, delete = parse_pubmed_xml(BytesIO(xml_content))
+
+        for record in (citation["MedlineCitation"], delete["DeleteCitation"][0]):
+            self.assertEqual(record["PMID"], [{"@Version": "1"}])
+            self.assertIsNone(self._simulate_pmid_extraction(record["PMID"]))
+
     def test_article_title_simple(self) -> None:
         data = "Hello World"
         result = self._simulate_title_extraction(data)
@@ -255,6 +275,12 @@ class TestStagingLayerJsonLogic(unittest.TestCase):
         self.assertEqual(result, "Background info. More info. Methods info.")
 
 
+def _batch_rank(row: Dict[str, Any]) -> Tuple[str, float, int]:
+    """Sort key for 'order by file_name desc, ingestion_ts desc, record_seq desc nulls last'."""
+    record_seq: Optional[int] = row.get("record_seq")
+    return row.get("file_name", ""), row["ingestion_ts"], -1 if record_seq is None else record_seq
+
+
 class TestPhysicalHardDeleteLogic(unittest.TestCase):
     """
     Tests for the Physical Hard Delete logic implemented in int_pubmed_deduped.sql.
@@ -278,7 +304,7 @@ class TestPhysicalHardDeleteLogic(unittest.TestCase):
 
         upserts_to_apply = []
         for _pmid, rows in batch_grouped.items():
-            rows.sort(key=lambda x: (x.get("file_name", ""), x["ingestion_ts"]), reverse=True)
+            rows.sort(key=_batch_rank, reverse=True)
             winner = rows[0]
             if winner["operation"] == "upsert":
                 upserts_to_apply.append(winner)
@@ -295,7 +321,7 @@ class TestPhysicalHardDeleteLogic(unittest.TestCase):
 
         ids_to_delete = set()
         for pmid, rows in batch_grouped.items():
-            rows.sort(key=lambda x: (x.get("file_name", ""), x["ingestion_ts"]), reverse=True)
+            rows.sort(key=_batch_rank, reverse=True)
             winner = rows[0]
             if winner["operation"] == "delete":
                 ids_to_delete.add(pmid)
@@ -10,8 +10,16 @@
 
 import unittest
 from io import BytesIO
+from typing import Any, Iterator
+from unittest.mock import patch
 
-from coreason_etl_pubmedabstracts.pipelines.xml_utils import parse_pubmed_xml
+from coreason_etl_pubmedabstracts.pipelines.xml_utils import (
+    _KEY_CACHE_SIZE,
+    CONTENT_HASH_KEY,
+    _attr_key,
+    _local_name,
+    parse_pubmed_xml,
+)
 
 
 class TestXmlUtils(unittest.TestCase):
@@ -133,7 +141,7 @@ class TestXmlUtils(unittest.TestCase):
         pub_types = citation["Article"]["PublicationTypeList"]["PublicationType"]
         self.assertIsInstance(pub_types, list)
         self.assertEqual(len(pub_types), 1)
-        # Without attributes, xmltodict returns the string directly
+        # Without attributes, the value is the string itself
         self.assertEqual(pub_types[0], "Journal Article")
 
         # MeshHeading should be a list
@@ -163,7 +171,7 @@ class TestXmlUtils(unittest.TestCase):
         records = list(parse_pubmed_xml(stream))
 
         title = records[0]["MedlineCitation"]["Article"]["ArticleTitle"]
-        # Whitespace handling in lxml/xmltodict can be tricky, so we strip
+        # Whitespace around the flattened tags is kept as is, so we normalize it
         # But generally, it should concatenate text.
         # "Usage of " + "italics" + " and " + "bold" + " in titles."
         self.assertIn("Usage of italics and bold in titles.", title.replace("\n", " ").replace("  ", " "))
@@ -201,6 +209,47 @@ class TestXmlUtils(unittest.TestCase):
         # Verify <i> is gone
         self.assertNotIn("<i>", title)
 
+    def test_namespaced_attributes(self) -> None:
+        """Test attribute keys: namespaced attributes keep their prefix, xmlns declarations are dropped."""
+        xml_content = b"""
+        <PubmedArticleSet xmlns:ns="http://example.com/ns">
+            <ns:MedlineCitation>
+                <ns:PMID ns:Version="1">123</ns:PMID>
+                <VernacularTitle xml:lang="fr">Titre</VernacularTitle>
+            </ns:MedlineCitation>
+        </PubmedArticleSet>
+        """
+        records = list(parse_pubmed_xml(BytesIO(xml_content)))
+
+        citation = records[0]["MedlineCitation"]
+        self.assertEqual(citation["PMID"], [{"@ns:Version": "1", "#text": "123"}])
+        self.assertEqual(citation["VernacularTitle"], {"@xml:lang": "fr", "#text": "Titre"})
+        self.assertNotIn("@xmlns:ns", citation)
+
+    def test_content_hash(self) -> None:
+        """Test that the content hash fingerprints the canonical lxml serialization of the record element."""
+        xml_content = b"""
+        <PubmedArticleSet>
+            <MedlineCitation><PMID>1</PMID><ArticleTitle>A <i>b</i></ArticleTitle></MedlineCitation>
+            <MedlineCitation><PMID>1</PMID><ArticleTitle>A <b>b</b></ArticleTitle></MedlineCitation>
+            <MedlineCitation><PMID>1</PMID><ArticleTitle>A <i>b</i></ArticleTitle></MedlineCitation>
+            <DeleteCitation><PMID>1</PMID></DeleteCitation>
+        </PubmedArticleSet>
+        """
+        records = list(parse_pubmed_xml(BytesIO(xml_content), content_hash=True))
+        hashes = [r[CONTENT_HASH_KEY] for r in records]
+
+        self.assertTrue(all(len(h) == 32 for h in hashes))
+        # Same flattened title, but the markup differs
+        self.assertEqual(records[0]["MedlineCitation"], records[1]["MedlineCitation"])
+        self.assertNotEqual(hashes[0], hashes[1])
+        self.assertEqual(hashes[0], hashes[2])
+        self.assertEqual(len(set(hashes)), 3)
+
+        # Not computed by default
+        records = list(parse_pubmed_xml(BytesIO(xml_content)))
+        self.assertFalse(any(CONTENT_HASH_KEY in r for r in records))
+
     def test_utf8_encoding(self) -> None:
         """Test that UTF-8 characters are preserved."""
         xml_content = (
@@ -246,6 +295,45 @@ class TestXmlUtils(unittest.TestCase):
         self.assertIsInstance(substances, list)
         self.assertEqual(substances[0]["#text"], "TestSubstance")
 
+    def test_key_caches_are_bounded(self) -> None:
+        """Test that unbounded tag and attribute vocabularies do not grow the key caches forever."""
+        count = _KEY_CACHE_SIZE + 100
+        children = b"".join(b'<T%d A%d="v"/>' % (i, i) for i in range(count))
+        xml_content = b"<PubmedArticleSet><MedlineCitation>" + children + b"</MedlineCitation></PubmedArticleSet>"
+
+        citation = next(parse_pubmed_xml(BytesIO(xml_content)))["MedlineCitation"]
+
+        self.assertEqual(len(citation), count)
+        self.assertEqual(citation["T0"], {"@A0": "v"})
+        self.assertLessEqual(_local_name.cache_info().currsize, _KEY_CACHE_SIZE)
+        self.assertLessEqual(_attr_key.cache_info().currsize, _KEY_CACHE_SIZE)
+
+    def test_parsed_records_are_released(self) -> None:
+        """Test that earlier records and their wrapper elements are removed from the tree while parsing."""
+        from lxml import etree
+
+        article = (
+            b"<PubmedArticle><MedlineCitation><PMID>1</PMID></MedlineCitation>"
+            b"<PubmedData><History><PubMedPubDate/></History></PubmedData></PubmedArticle>"
+        )
+        delete = b"<DeleteCitation><PMID>2</PMID></DeleteCitation>"
+        xml_content = b"<PubmedArticleSet>" + article * 50 + delete + b"</PubmedArticleSet>"
+
+        sizes = []
+        iterparse = etree.iterparse
+
+        def record_root_size(*args: Any, **kwargs: Any) -> Iterator[Any]:
+            for event, elem in iterparse(*args, **kwargs):
+                sizes.append(len(elem.getroottree().getroot()))
+                yield event, elem
+
+        with patch("coreason_etl_pubmedabstracts.pipelines.xml_utils.etree.iterparse", record_root_size):
+            records = list(parse_pubmed_xml(BytesIO(xml_content)))
+
+        self.assertEqual(len(records), 51)
+        # By the last record only the previous, already cleared wrapper is left besides it
+        self.assertEqual(sizes[-1], 2)
+
     def test_parse_empty_stream(self) -> None:
         """Test that an empty stream returns no records and does not crash."""
         stream = BytesIO(b"")